@@ -187,13 +187,13 @@ def _organize_data(distortion_list: list) -> dict:
         energies.
     """
     defect_energies_dict = {"distortions": {}}
-    for i in range(len(distortion_list) // 2):
-        i *= 2
-        key = _format_distortion_names(distortion_list[i])
+    # file alternates distortion name and energy lines:
+    for name, energy in zip(distortion_list[::2], distortion_list[1::2]):
+        key = _format_distortion_names(name)
         if isinstance(key, str) and "Unperturbed" in key:
-            defect_energies_dict["Unperturbed"] = float(distortion_list[i + 1])
+            defect_energies_dict["Unperturbed"] = float(energy)
         else:
-            defect_energies_dict["distortions"][key] = float(distortion_list[i + 1])
+            defect_energies_dict["distortions"][key] = float(energy)
 
     # Order dict items by key (e.g. from -0.6 to 0 to +0.6):
     sorted_energies_dict = {
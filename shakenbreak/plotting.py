@@ -101,8 +101,9 @@ def _format_defect_name(
     """
     if not isinstance(defect_species, str):  # Check inputs
         raise(TypeError(f"`defect_species` {defect_species} must be a string"))
+    name_parts = defect_species.split("_")  # split name once, reused below
     try:
-        charge = defect_species.split("_")[-1]  # charge comes last
+        charge = name_parts[-1]  # charge comes last
         charge = int(charge)
     except ValueError:
         raise(ValueError(
@@ -112,22 +113,20 @@ def _format_defect_name(
     # Format defect name for title/axis labels
     if charge > 0:
         charge = "+" + str(charge)  # show positive charges with a + sign
-    defect_type = defect_species.split("_")[0]  # vac, as or int
+    defect_type = name_parts[0]  # vac, as or int
     if (
         defect_type == "Int"
     ):  #  for interstitials, name formatting is different (eg Int_Cd_1 vs vac_1_Cd)
-        site_element = defect_species.split("_")[1]
-        site = defect_species.split("_")[2]
+        site_element = name_parts[1]
+        site = name_parts[2]
         if include_site_num_in_name:
             # by default include defect site in defect name for interstitials
             defect_name = f"{site_element}$_{{i_{site}}}^{{{charge}}}$"
         else:
             defect_name = f"{site_element}$_i^{{{charge}}}$"
     else:
-        site = defect_species.split("_")[
-            1
-        ]  # number indicating defect site (from doped)
-        site_element = defect_species.split("_")[2]  # element at defect site
+        site = name_parts[1]  # number indicating defect site (from doped)
+        site_element = name_parts[2]  # element at defect site
 
     if include_site_num_in_name:  # whether to include the site number in defect name
         if defect_type == "vac":
@@ -135,7 +134,7 @@ def _format_defect_name(
             # double brackets to treat it literally (tex), then extra {} for
             # python str formatting
         elif defect_type in ["as", "sub"]:
-            subs_element = defect_species.split("_")[4]
+            subs_element = name_parts[4]
             defect_name = f"{site_element}$_{{{subs_element}_{site}}}^{{{charge}}}$"
         elif defect_type != "Int":
             raise ValueError(
@@ -145,7 +144,7 @@ def _format_defect_name(
         if defect_type == "vac":
             defect_name = f"V$_{{{site_element}}}^{{{charge}}}$"
         elif defect_type in ["as", "sub"]:
-            subs_element = defect_species.split("_")[4]
+            subs_element = name_parts[4]
             defect_name = f"{site_element}$_{{{subs_element}}}^{{{charge}}}$"
         elif defect_type != "Int":
             raise ValueError(
@@ -215,8 +214,9 @@ def _change_energy_units_to_meV(
         max_energy_above_unperturbed = (
             max_energy_above_unperturbed * 1000
         )  # convert to meV
-    for key in energies_dict["distortions"].keys():  # convert to meV
-        energies_dict["distortions"][key] = energies_dict["distortions"][key] * 1000
+    energies_dict["distortions"] = {
+        k: v * 1000 for k, v in energies_dict["distortions"].items()
+    }  # convert to meV
     energies_dict["Unperturbed"] = energies_dict["Unperturbed"] * 1000
     return energies_dict, max_energy_above_unperturbed, y_label
 
@@ -1,5 +1,6 @@
 import unittest
 import os
+from collections.abc import Mapping
 from unittest.mock import patch
 import shutil
 import warnings
@@ -20,35 +21,65 @@ def if_present_rm(path):
             shutil.rmtree(path)
 
 
+def clone_organized_data(energies_dict):
+    """
+    Copy an organized energies dict (as returned by `analysis._organize_data`),
+    copying the nested "distortions" dict while sharing its float values.
+    """
+    return {
+        key: dict(value) if isinstance(value, Mapping) else value
+        for key, value in energies_dict.items()
+    }
+
+
+# parsed energy files, shared by all tests in this module
+_PARSED_DATA_CACHE = {}
+
+
+def _load_distortion_data(path):
+    """
+    Parse energies file with `_open_file` and `_organize_data` once per test
+    module, returning copies of the file lines and organized data dict.
+    """
+    if path not in _PARSED_DATA_CACHE:
+        distortion_data = analysis._open_file(path)
+        _PARSED_DATA_CACHE[path] = (
+            distortion_data,
+            analysis._organize_data(distortion_data),
+        )
+    distortion_data, organized_data = _PARSED_DATA_CACHE[path]
+    return list(distortion_data), clone_organized_data(organized_data)
+
+
 class AnalyseDefectsTestCase(unittest.TestCase):
     def setUp(self):
         self.DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
         self.VASP_CDTE_DATA_DIR = os.path.join(self.DATA_DIR, "vasp/CdTe")
-        self.V_Cd_distortion_data = analysis._open_file(
+        (
+            self.V_Cd_distortion_data,
+            self.organized_V_Cd_distortion_data,
+        ) = _load_distortion_data(
             os.path.join(self.VASP_CDTE_DATA_DIR, "CdTe_vac_1_Cd_0_stdev_0.25.txt")
         )
-        self.organized_V_Cd_distortion_data = analysis._organize_data(
-            self.V_Cd_distortion_data
-        )
-        self.V_Cd_distortion_data_no_unperturbed = analysis._open_file(
+        (
+            self.V_Cd_distortion_data_no_unperturbed,
+            self.organized_V_Cd_distortion_data_no_unperturbed,
+        ) = _load_distortion_data(
             os.path.join(
                 self.VASP_CDTE_DATA_DIR, "CdTe_vac_1_Cd_0_stdev_0.25_no_unperturbed.txt"
             )
         )
-        self.organized_V_Cd_distortion_data_no_unperturbed = analysis._organize_data(
-            self.V_Cd_distortion_data_no_unperturbed
-        )
         self.V_Cd_minus0pt5_struc_rattled = Structure.from_file(
             os.path.join(
                 self.VASP_CDTE_DATA_DIR, "CdTe_V_Cd_-50%_Distortion_Rattled_POSCAR"
             )
         )
-        self.In_Cd_1_distortion_data = analysis._open_file(
+        (
+            self.In_Cd_1_distortion_data,
+            self.organized_In_Cd_1_distortion_data,
+        ) = _load_distortion_data(
             os.path.join(self.VASP_CDTE_DATA_DIR, "CdTe_sub_1_In_on_Cd_1.txt")
         )  # note this was rattled with the old, non-Monte Carlo rattling (ASE's atoms.rattle())
-        self.organized_In_Cd_1_distortion_data = analysis._organize_data(
-            self.In_Cd_1_distortion_data
-        )
         self.Int_Cd_2_minus0pt6_NN_10_struc_rattled = Structure.from_file(
             os.path.join(
                 self.VASP_CDTE_DATA_DIR, "CdTe_Int_Cd_2_-60%_Distortion_NN_10_POSCAR"
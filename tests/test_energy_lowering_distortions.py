@@ -1,23 +1,108 @@
 import unittest
 import os
+import errno
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, Mock
 import shutil
+import tempfile
 import warnings
+from pathlib import Path
 import numpy as np
 
 from pymatgen.core.structure import Structure, Element
 from pymatgen.io.ase import AseAtomsAdaptor
-import ase
+import ase.io.espresso
 
-from shakenbreak import analysis, energy_lowering_distortions, io
+from shakenbreak import energy_lowering_distortions, io
 
 
 def if_present_rm(path):
-    if os.path.exists(path):
-        if os.path.isfile(path):
-            os.remove(path)
-        elif os.path.isdir(path):
-            shutil.rmtree(path)
+    try:
+        shutil.rmtree(path)
+    except NotADirectoryError:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _atomic_disp_fast(struct, ref_struct):
+    """
+    Displacements (in Å) of each site in struct from the nearest site of the
+    same species in ref_struct (using the minimum image convention), computed
+    with a single NumPy broadcast over all site pairs. Only meaningful once the
+    lattices and numbers of sites of both structures have been checked to match.
+    """
+    frac_diff = struct.frac_coords[:, None, :] - ref_struct.frac_coords[None, :, :]
+    frac_diff -= np.round(frac_diff)
+    cart_diff = np.dot(frac_diff, struct.lattice.matrix)
+    dists = np.sqrt(np.einsum("ijk,ijk->ij", cart_diff, cart_diff))
+    species = np.array([site.specie.symbol for site in struct])
+    ref_species = np.array([site.specie.symbol for site in ref_struct])
+    dists[species[:, None] != ref_species[None, :]] = np.inf
+    return dists.min(axis=1)
+
+
+def _link(src, dst):
+    """Hard link read-only test input files, rather than copying them"""
+    if not os.path.exists(dst):
+        os.link(src, dst)
+
+
+def _clone_tree(src, dst):
+    """
+    Recreate the directory tree at src in dst, hard linking files rather than
+    copying them (falling back to copying if linking is not possible).
+    """
+    os.makedirs(dst, exist_ok=True)
+    with os.scandir(src) as entries:
+        for entry in entries:
+            dst_path = os.path.join(dst, entry.name)
+            if entry.is_dir(follow_symlinks=False):
+                _clone_tree(entry.path, dst_path)
+                continue
+            if os.path.lexists(dst_path):
+                os.unlink(dst_path)  # replace rather than write through the old file
+            try:
+                os.link(entry.path, dst_path)
+            except OSError as exc:
+                if exc.errno not in (errno.EXDEV, errno.EPERM):
+                    raise
+                shutil.copy2(entry.path, dst_path)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_structure(path, mtime):
+    return Structure.from_file(path)
+
+
+def load_structure(path):
+    """Parse structure file, reusing the parsed Structure if the file is unchanged"""
+    return _cached_structure(path, os.path.getmtime(path))
+
+
+def assert_structures_equal(structures, expected_structures):
+    """
+    Compare lists of structures (with the same site ordering) in one go,
+    using stacked species, lattice and fractional coordinate arrays.
+    """
+    # check lengths first, so mismatches don't give ragged arrays:
+    assert len(structures) == len(expected_structures)
+    assert [len(s) for s in structures] == [len(s) for s in expected_structures]
+    np.testing.assert_array_equal(
+        np.array([[str(sp) for sp in s.species] for s in structures]),
+        np.array([[str(sp) for sp in s.species] for s in expected_structures]),
+    )
+    np.testing.assert_allclose(
+        np.stack([s.lattice.matrix for s in structures]),
+        np.stack([s.lattice.matrix for s in expected_structures]),
+        atol=1e-5,
+    )
+    np.testing.assert_allclose(
+        np.stack([s.frac_coords for s in structures]),
+        np.stack([s.frac_coords for s in expected_structures]),
+        atol=1e-5,
+    )
 
 
 # https://stackoverflow.com/questions/54838354/
@@ -37,38 +122,48 @@ Mock.assert_not_called_with = assert_not_called_with
 
 
 class EnergyLoweringDistortionsTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+        # copy the data directories once per class, so that test-generated folders
+        # are written to a temporary copy rather than the repository data
+        cls.TMP_DIR = tempfile.TemporaryDirectory()
+        for code_dir in ["vasp/CdTe", "castep", "cp2k", "fhi_aims", "quantum_espresso"]:
+            shutil.copytree(
+                os.path.join(cls.DATA_DIR, code_dir),
+                os.path.join(cls.TMP_DIR.name, code_dir),
+                dirs_exist_ok=True,
+            )
+        cls.VASP_CDTE_DATA_DIR = os.path.join(cls.TMP_DIR.name, "vasp/CdTe")
+        cls.CASTEP_DATA_DIR = os.path.join(cls.TMP_DIR.name, "castep")
+        cls.CP2K_DATA_DIR = os.path.join(cls.TMP_DIR.name, "cp2k")
+        cls.FHI_AIMS_DATA_DIR = os.path.join(cls.TMP_DIR.name, "fhi_aims")
+        cls.ESPRESSO_DATA_DIR = os.path.join(cls.TMP_DIR.name, "quantum_espresso")
+        cls._aaa = AseAtomsAdaptor()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.TMP_DIR.cleanup()
+
     def setUp(self):
-        self.DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
-        self.VASP_CDTE_DATA_DIR = os.path.join(self.DATA_DIR, "vasp/CdTe")
-        self.CASTEP_DATA_DIR = os.path.join(self.DATA_DIR, "castep")
-        self.CP2K_DATA_DIR = os.path.join(self.DATA_DIR, "cp2k")
-        self.FHI_AIMS_DATA_DIR = os.path.join(self.DATA_DIR, "fhi_aims")
-        self.ESPRESSO_DATA_DIR = os.path.join(self.DATA_DIR, "quantum_espresso")
-        self.V_Cd_minus_0pt55_structure = Structure.from_file(
+        self.V_Cd_minus_0pt55_structure = load_structure(
             self.VASP_CDTE_DATA_DIR + "/vac_1_Cd_0/Bond_Distortion_-55.0%/CONTCAR"
         )
 
         # create fake distortion folders for testing functionality:
         for defect_dir in ["Int_Cd_2_1", "vac_1_Cd_-1", "vac_1_Cd_-2"]:
-            if not os.path.exists(f"{self.VASP_CDTE_DATA_DIR}/{defect_dir}"):
-                os.mkdir(self.VASP_CDTE_DATA_DIR + f"/{defect_dir}")
+            os.makedirs(f"{self.VASP_CDTE_DATA_DIR}/{defect_dir}", exist_ok=True)
         # Int_Cd_2_1 without data, to test warnings
         V_Cd_1_txt = f"""Bond_Distortion_-7.5%
                 -205.700
                 Unperturbed
                 -205.800"""
-        with open(
-            os.path.join(self.VASP_CDTE_DATA_DIR, "vac_1_Cd_-1/vac_1_Cd_-1.txt"), "w"
-        ) as fp:
-            fp.write(V_Cd_1_txt)
+        Path(self.VASP_CDTE_DATA_DIR, "vac_1_Cd_-1/vac_1_Cd_-1.txt").write_text(V_Cd_1_txt)
         V_Cd_2_txt = f"""Bond_Distortion_-35.0%
                 -206.000
                 Unperturbed
                 -205.800"""
-        with open(
-            os.path.join(self.VASP_CDTE_DATA_DIR, "vac_1_Cd_-2/vac_1_Cd_-2.txt"), "w"
-        ) as fp:
-            fp.write(V_Cd_2_txt)
+        Path(self.VASP_CDTE_DATA_DIR, "vac_1_Cd_-2/vac_1_Cd_-2.txt").write_text(V_Cd_2_txt)
 
         self.defect_charges_dict = {
             "vac_1_Cd": [0, -1, -2],
@@ -86,17 +181,21 @@ class EnergyLoweringDistortionsTestCase(unittest.TestCase):
         ]
 
     def tearDown(self):
-        # removed generated folders
-        for data_dir in [
-            self.VASP_CDTE_DATA_DIR,
-            self.CASTEP_DATA_DIR,
-            self.CP2K_DATA_DIR,
-            self.FHI_AIMS_DATA_DIR,
-            self.ESPRESSO_DATA_DIR,
-        ]:
-            for defect_dir in self.defect_folders_list + ["vac_1_Cd_-1",
-                                                          "vac_1_Cd_-2"]:
-                if_present_rm(os.path.join(data_dir, defect_dir))
+        _cached_structure.cache_clear()  # avoid stale entries for removed files
+        # removed generated folders (independent paths, so removed concurrently)
+        paths = [
+            os.path.join(data_dir, defect_dir)
+            for data_dir in [
+                self.VASP_CDTE_DATA_DIR,
+                self.CASTEP_DATA_DIR,
+                self.CP2K_DATA_DIR,
+                self.FHI_AIMS_DATA_DIR,
+                self.ESPRESSO_DATA_DIR,
+            ]
+            for defect_dir in self.defect_folders_list + ["vac_1_Cd_-1", "vac_1_Cd_-2"]
+        ]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(if_present_rm, paths))
 
     def test_read_defects_directories(self):
         """Test reading defect directories and parsing to dictionaries"""
@@ -132,17 +231,42 @@ class EnergyLoweringDistortionsTestCase(unittest.TestCase):
         for i in expected_dict:  # Need to do this way to allow different list orders
             self.assertCountEqual(defect_charges_dict[i], expected_dict[i])
 
+    def _get_low_energy_defects(self, **kwargs):
+        """Run get_energy_lowering_distortions() for the CdTe test defects"""
+        return energy_lowering_distortions.get_energy_lowering_distortions(
+            self.defect_charges_dict, self.VASP_CDTE_DATA_DIR, **kwargs
+        )
+
+    def _assert_entry(
+        self,
+        entry,
+        charges,
+        energy_diffs,
+        bond_distortions,
+        structures,
+        excluded_charges,
+    ):
+        """Check all fields of an entry in the low_energy_defects dictionary"""
+        self.assertEqual(entry["charges"], charges)
+        np.testing.assert_almost_equal(entry["energy_diffs"], energy_diffs)
+        self.assertEqual(entry["bond_distortions"], bond_distortions)
+        assert_structures_equal(entry["structures"], structures)
+        self.assertEqual(entry["excluded_charges"], excluded_charges)
+
     def test_get_energy_lowering_distortions(self):
         """Test get_energy_lowering_distortions() function"""
-        with patch("builtins.print") as mock_print, warnings.catch_warnings(
-            record=True
-        ) as w:
+        v0 = f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_0"
+        vm1 = f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-1"
+        vm2 = f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2"
+        int_cd_txt = f"{self.VASP_CDTE_DATA_DIR}/Int_Cd_2_1/Int_Cd_2_1.txt"
+        distorted_contcar = f"{v0}/Bond_Distortion_-20.0%/CONTCAR"
+        # get_energy_lowering_distortions() is run once per set of kwargs and
+        # data on disk, with all checks for that stage sharing the output
+        with self.subTest(stage="default"), patch(
+            "builtins.print"
+        ) as mock_print, warnings.catch_warnings(record=True) as w:
             warnings.filterwarnings("ignore", category=DeprecationWarning)
-            low_energy_defects_dict = (
-                energy_lowering_distortions.get_energy_lowering_distortions(
-                    self.defect_charges_dict, self.VASP_CDTE_DATA_DIR
-                )
-            )
+            low_energy_defects_dict = self._get_low_energy_defects()
             mock_print.assert_any_call("\nvac_1_Cd")
             mock_print.assert_any_call(
                 "vac_1_Cd_0: Energy difference between minimum, found with -0.55 bond distortion, "
@@ -164,13 +288,13 @@ class EnergyLoweringDistortionsTestCase(unittest.TestCase):
             mock_print.assert_any_call(
                 f"Problem parsing final, low-energy structure for "
                 f"-0.35 bond distortion of vac_1_Cd_-2 "
-                f"at {self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2/Bond_Distortion_-35.0%/CONTCAR. This species will be skipped and "
+                f"at {vm2}/Bond_Distortion_-35.0%/CONTCAR. This species will be skipped and "
                 f"will not be included in low_energy_defects (check"
                 f"relaxation calculation and folder)."
             )
             mock_print.assert_any_call("\nInt_Cd_2")
             mock_print.assert_any_call(
-                f"Path {self.VASP_CDTE_DATA_DIR}/Int_Cd_2_1/Int_Cd_2_1.txt does not exist"
+                f"Path {int_cd_txt} does not exist"
             )
             mock_print.assert_any_call(
                 "No data parsed for Int_Cd_2_1. This species will be skipped and will not be "
@@ -194,7 +318,7 @@ class EnergyLoweringDistortionsTestCase(unittest.TestCase):
             for warning in w:
                 self.assertEqual(warning.category, UserWarning)
             warning_message = (
-                f"No data parsed from {self.VASP_CDTE_DATA_DIR}/Int_Cd_2_1/Int_Cd_2_1.txt, "
+                f"No data parsed from {int_cd_txt}, "
                 f"returning None"
             )
             self.assertIn(warning_message, str(w[0].message))
@@ -202,28 +326,19 @@ class EnergyLoweringDistortionsTestCase(unittest.TestCase):
             self.assertEqual(len(low_energy_defects_dict), 1)
             self.assertIn("vac_1_Cd", low_energy_defects_dict)
             self.assertEqual(len(low_energy_defects_dict["vac_1_Cd"]), 1)
-            self.assertEqual(low_energy_defects_dict["vac_1_Cd"][0]["charges"], [0])
-            np.testing.assert_almost_equal(
-                low_energy_defects_dict["vac_1_Cd"][0]["energy_diffs"],
-                [-0.7551820700000178],
-            )
-            self.assertEqual(
-                low_energy_defects_dict["vac_1_Cd"][0]["bond_distortions"], [-0.55]
-            )
-            self.assertEqual(
-                low_energy_defects_dict["vac_1_Cd"][0]["structures"],
-                [self.V_Cd_minus_0pt55_structure],
-            )
-            self.assertEqual(
-                low_energy_defects_dict["vac_1_Cd"][0]["excluded_charges"], set()
+            self._assert_entry(
+                low_energy_defects_dict["vac_1_Cd"][0],
+                charges=[0],
+                energy_diffs=[-0.7551820700000178],
+                bond_distortions=[-0.55],
+                structures=[self.V_Cd_minus_0pt55_structure],
+                excluded_charges=set(),
             )
 
         # test verbose=False output:
-        with patch("builtins.print") as mock_print:
-            low_energy_defects_dict = (
-                energy_lowering_distortions.get_energy_lowering_distortions(
-                    self.defect_charges_dict, self.VASP_CDTE_DATA_DIR, verbose=False
-                )
+        with self.subTest(stage="verbose=False"), patch("builtins.print") as mock_print:
+            low_energy_defects_dict = self._get_low_energy_defects(
+                verbose=False
             )  # same call as before, just with verbose=False
             mock_print.assert_not_called_with(
                 "vac_1_Cd_0: Energy difference between minimum, found with -0.55 bond distortion, "
@@ -235,15 +350,11 @@ class EnergyLoweringDistortionsTestCase(unittest.TestCase):
             )
 
         # test min_e_diff kwarg:
-        with patch("builtins.print") as mock_print, warnings.catch_warnings(
-            record=True
-        ) as w:
+        with self.subTest(stage="min_e_diff"), patch(
+            "builtins.print"
+        ) as mock_print, warnings.catch_warnings(record=True) as w:
             warnings.filterwarnings("ignore", category=DeprecationWarning)
-            low_energy_defects_dict = (
-                energy_lowering_distortions.get_energy_lowering_distortions(
-                    self.defect_charges_dict, self.VASP_CDTE_DATA_DIR, min_e_diff=0.8
-                )
-            )
+            low_energy_defects_dict = self._get_low_energy_defects(min_e_diff=0.8)
             mock_print.assert_any_call("\nvac_1_Cd")
             mock_print.assert_any_call(
                 "vac_1_Cd_0: Energy difference between minimum, found with -0.55 bond distortion, "
@@ -261,12 +372,12 @@ class EnergyLoweringDistortionsTestCase(unittest.TestCase):
             )
             mock_print.assert_any_call("\nInt_Cd_2")
             mock_print.assert_any_call(
-                f"Path {self.VASP_CDTE_DATA_DIR}/Int_Cd_2_1/Int_Cd_2_1.txt does not exist"
+                f"Path {int_cd_txt} does not exist"
             )
             self.assertEqual(len(w), 1)  # No Int_Cd_2_1 data (1)
             self.assertEqual(warning.category, UserWarning)
             warning_message = (
-                f"No data parsed from {self.VASP_CDTE_DATA_DIR}/Int_Cd_2_1/Int_Cd_2_1.txt, "
+                f"No data parsed from {int_cd_txt}, "
                 f"returning None"
             )
             self.assertIn(warning_message, str(w[0].message))
@@ -279,28 +390,27 @@ class EnergyLoweringDistortionsTestCase(unittest.TestCase):
         # match with V_Cd_0 Unperturbed first (i.e. starts with unperturbed,
         # then rattled, then distortions
         for fake_distortion_dir in ["Bond_Distortion_-7.5%", "Unperturbed"]:
-            os.mkdir(f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-1/{fake_distortion_dir}")
-            shutil.copyfile(
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_0/Bond_Distortion_-20.0%/CONTCAR",
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-1/{fake_distortion_dir}/CONTCAR",
+            os.mkdir(f"{vm1}/{fake_distortion_dir}")
+            _link(
+                distorted_contcar,
+                f"{vm1}/{fake_distortion_dir}/CONTCAR",
             )
 
         for fake_distortion_dir in ["Bond_Distortion_-35.0%", "Unperturbed"]:
-            os.mkdir(f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2/{fake_distortion_dir}")
-            shutil.copyfile(
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_0/Bond_Distortion_-20.0%/CONTCAR",
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2/{fake_distortion_dir}/CONTCAR",
+            os.mkdir(f"{vm2}/{fake_distortion_dir}")
+            _link(
+                distorted_contcar,
+                f"{vm2}/{fake_distortion_dir}/CONTCAR",
             )
 
-        with patch("builtins.print") as mock_print:
-            low_energy_defects_dict = (
-                energy_lowering_distortions.get_energy_lowering_distortions(
-                    self.defect_charges_dict, self.VASP_CDTE_DATA_DIR
-                )
-            )  # same call as before
+        with self.subTest(stage="different distortions"), patch(
+            "builtins.print"
+        ) as mock_print:
+            low_energy_defects_dict = self._get_low_energy_defects()
+            # same call as before
             mock_print.assert_not_called_with(
                 f"Problem parsing final, low-energy structure for -35.0% bond distortion of "
-                f"vac_1_Cd_-2 at {self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2/Bond_Distortion_-35.0%/CONTCAR. "
+                f"vac_1_Cd_-2 at {vm2}/Bond_Distortion_-35.0%/CONTCAR. "
                 f"This species will be skipped and will not be included in low_energy_defects ("
                 f"check relaxation calculation and folder)."
             )
@@ -320,44 +430,23 @@ class EnergyLoweringDistortionsTestCase(unittest.TestCase):
             self.assertEqual(len(low_energy_defects_dict), 1)
             self.assertIn("vac_1_Cd", low_energy_defects_dict)
             self.assertEqual(len(low_energy_defects_dict["vac_1_Cd"]), 2)
-            self.assertEqual(low_energy_defects_dict["vac_1_Cd"][0]["charges"], [0])
-            np.testing.assert_almost_equal(
-                low_energy_defects_dict["vac_1_Cd"][0]["energy_diffs"],
-                [-0.7551820700000178],
-            )
-            self.assertEqual(
-                low_energy_defects_dict["vac_1_Cd"][0]["bond_distortions"], [-0.55]
-            )
-            self.assertEqual(
-                low_energy_defects_dict["vac_1_Cd"][0]["structures"],
-                [self.V_Cd_minus_0pt55_structure],
-            )
-            self.assertEqual(
-                low_energy_defects_dict["vac_1_Cd"][0]["excluded_charges"], {-1, -2}
-            )
-            self.assertEqual(
-                low_energy_defects_dict["vac_1_Cd"][1]["charges"], [-2, 0, -1]
-            )
-            np.testing.assert_almost_equal(
-                low_energy_defects_dict["vac_1_Cd"][1]["energy_diffs"],
-                [-0.2, 0.0, 0.0],
-            )
-            self.assertEqual(
-                low_energy_defects_dict["vac_1_Cd"][1]["bond_distortions"],
-                [-0.35, "Unperturbed", "Unperturbed"],
-            )
-            unperturbed_structure = Structure.from_file(
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_0/Unperturbed/CONTCAR"
-            )
-            distorted_structure = Structure.from_file(
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_0/Bond_Distortion_-20.0%/CONTCAR"
-            )
-            self.assertEqual(
-                low_energy_defects_dict["vac_1_Cd"][1]["structures"],
-                [distorted_structure, unperturbed_structure, distorted_structure],
-            )
-            self.assertEqual(
-                low_energy_defects_dict["vac_1_Cd"][1]["excluded_charges"], set()
+            self._assert_entry(
+                low_energy_defects_dict["vac_1_Cd"][0],
+                charges=[0],
+                energy_diffs=[-0.7551820700000178],
+                bond_distortions=[-0.55],
+                structures=[self.V_Cd_minus_0pt55_structure],
+                excluded_charges={-1, -2},
+            )
+            unperturbed_structure = load_structure(f"{v0}/Unperturbed/CONTCAR")
+            distorted_structure = load_structure(distorted_contcar)
+            self._assert_entry(
+                low_energy_defects_dict["vac_1_Cd"][1],
+                charges=[-2, 0, -1],
+                energy_diffs=[-0.2, 0.0, 0.0],
+                bond_distortions=[-0.35, "Unperturbed", "Unperturbed"],
+                structures=[distorted_structure, unperturbed_structure, distorted_structure],
+                excluded_charges=set(),
             )
 
         # test case where the _same_ non-spontaneous energy lowering distortion
@@ -366,87 +455,52 @@ class EnergyLoweringDistortionsTestCase(unittest.TestCase):
         -206.700
         Unperturbed
         -205.800"""
-        with open(
-            os.path.join(self.VASP_CDTE_DATA_DIR, "vac_1_Cd_-1/vac_1_Cd_-1.txt"), "w"
-        ) as fp:
-            fp.write(V_Cd_1_txt_w_distortion)
-        with patch("builtins.print") as mock_print:
-            low_energy_defects_dict = (
-                energy_lowering_distortions.get_energy_lowering_distortions(
-                    self.defect_charges_dict, self.VASP_CDTE_DATA_DIR
-                )
-            )  # same call as before
+        Path(f"{vm1}/vac_1_Cd_-1.txt").write_text(V_Cd_1_txt_w_distortion)
+        with self.subTest(stage="same distortion"), patch(
+            "builtins.print"
+        ) as mock_print:
+            low_energy_defects_dict = self._get_low_energy_defects()
+            # same call as before
             mock_print.assert_any_call(
                 "Low-energy distorted structure for vac_1_Cd_-2 already "
                 "found with charge states [-1], storing together."
             )
             self.assertEqual(len(low_energy_defects_dict["vac_1_Cd"]), 2)
-            self.assertEqual(
-                low_energy_defects_dict["vac_1_Cd"][1]["charges"], [-1, -2, 0]
-            )
-            np.testing.assert_almost_equal(
-                low_energy_defects_dict["vac_1_Cd"][1]["energy_diffs"],
-                [-0.9, -0.2, 0.0],
-            )
-            self.assertEqual(
-                low_energy_defects_dict["vac_1_Cd"][1]["bond_distortions"],
-                [-0.075, -0.35, "Unperturbed"],
-            )
-            unperturbed_structure = Structure.from_file(
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_0/Unperturbed/CONTCAR"
-            )
-            distorted_structure = Structure.from_file(
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_0/Bond_Distortion_-20.0%/CONTCAR"
-            )
-            self.assertEqual(
-                low_energy_defects_dict["vac_1_Cd"][1]["structures"],
-                [distorted_structure, distorted_structure, unperturbed_structure],
-            )
-            self.assertEqual(
-                low_energy_defects_dict["vac_1_Cd"][1]["excluded_charges"], set()
+            unperturbed_structure = load_structure(f"{v0}/Unperturbed/CONTCAR")
+            distorted_structure = load_structure(distorted_contcar)
+            self._assert_entry(
+                low_energy_defects_dict["vac_1_Cd"][1],
+                charges=[-1, -2, 0],
+                energy_diffs=[-0.9, -0.2, 0.0],
+                bond_distortions=[-0.075, -0.35, "Unperturbed"],
+                structures=[distorted_structure, distorted_structure, unperturbed_structure],
+                excluded_charges=set(),
             )
         # all print messages and potential structure matching outcomes in `get_energy_lowering_distortions`
         # have now been tested in the above code
 
         # test min_dist kwarg:
-        low_energy_defects_dict = (
-            energy_lowering_distortions.get_energy_lowering_distortions(
-                self.defect_charges_dict, self.VASP_CDTE_DATA_DIR, min_dist=0.01
+        with self.subTest(stage="min_dist"):
+            low_energy_defects_dict = self._get_low_energy_defects(
+                min_dist=0.01
+            )  # same call as before, but with min_dist
+            self.assertEqual(len(low_energy_defects_dict["vac_1_Cd"]), 2)
+            zero_rattled_structure = load_structure(f"{v0}/Bond_Distortion_0.0%/CONTCAR")
+            distorted_structure = load_structure(distorted_contcar)
+            self._assert_entry(
+                low_energy_defects_dict["vac_1_Cd"][1],
+                charges=[-1, -2, 0],  #  still matches 0, but not with unperturbed
+                energy_diffs=[-0.9, -0.2, -0.0033911100000239003],
+                bond_distortions=[-0.075, -0.35, 0.0],
+                structures=[distorted_structure, distorted_structure, zero_rattled_structure],
+                excluded_charges=set(),
             )
-        )  # same call as before, but with min_dist
-        self.assertEqual(len(low_energy_defects_dict["vac_1_Cd"]), 2)
-        self.assertEqual(
-            low_energy_defects_dict["vac_1_Cd"][1]["charges"], [-1, -2, 0]
-        )  #  still matches 0, but not with unperturbed
-        np.testing.assert_almost_equal(
-            low_energy_defects_dict["vac_1_Cd"][1]["energy_diffs"],
-            [-0.9, -0.2, -0.0033911100000239003],
-        )
-        self.assertEqual(
-            low_energy_defects_dict["vac_1_Cd"][1]["bond_distortions"],
-            [-0.075, -0.35, 0.0],
-        )
-        zero_rattled_structure = Structure.from_file(
-            f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_0/Bond_Distortion_0.0%/CONTCAR"
-        )
-        distorted_structure = Structure.from_file(
-            f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_0/Bond_Distortion_-20.0%/CONTCAR"
-        )
-        self.assertEqual(
-            low_energy_defects_dict["vac_1_Cd"][1]["structures"],
-            [distorted_structure, distorted_structure, zero_rattled_structure],
-        )
-        self.assertEqual(
-            low_energy_defects_dict["vac_1_Cd"][1]["excluded_charges"], set()
-        )
 
         # test stol kwarg:
-        with warnings.catch_warnings(record=True) as w:
+        with self.subTest(stage="stol"), warnings.catch_warnings(record=True) as w:
             warnings.filterwarnings("ignore", category=DeprecationWarning)
-            low_energy_defects_dict = (
-                energy_lowering_distortions.get_energy_lowering_distortions(
-                    self.defect_charges_dict, self.VASP_CDTE_DATA_DIR, stol=0.01
-                )
+            low_energy_defects_dict = self._get_low_energy_defects(
+                stol=0.01
             )  # same call as before, but with stol
             self.assertEqual(
                 len(w), 21
@@ -464,22 +518,20 @@ class EnergyLoweringDistortionsTestCase(unittest.TestCase):
 
         # test no defects specified and write_input_files = True
         for fake_distortion_dir in ["Bond_Distortion_-7.5%", "Unperturbed"]:
-            if not os.path.exists(
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-1/{fake_distortion_dir}"
-            ):
-                os.mkdir(f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-1/{fake_distortion_dir}")
-            shutil.copyfile(
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_0/Bond_Distortion_-20.0%/CONTCAR",
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-1/{fake_distortion_dir}/CONTCAR",
+            os.makedirs(
+                f"{vm1}/{fake_distortion_dir}", exist_ok=True
+            )
+            _link(
+                distorted_contcar,
+                f"{vm1}/{fake_distortion_dir}/CONTCAR",
             )
         for fake_distortion_dir in ["Bond_Distortion_-35.0%", "Unperturbed"]:
-            if not os.path.exists(
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2/{fake_distortion_dir}"
-            ):
-                os.mkdir(f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2/{fake_distortion_dir}")
-            shutil.copyfile(
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_0/Bond_Distortion_-20.0%/CONTCAR",
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2/{fake_distortion_dir}/CONTCAR",
+            os.makedirs(
+                f"{vm2}/{fake_distortion_dir}", exist_ok=True
+            )
+            _link(
+                distorted_contcar,
+                f"{vm2}/{fake_distortion_dir}/CONTCAR",
             )
         low_energy_defects_dict = (
             energy_lowering_distortions.get_energy_lowering_distortions(
@@ -489,30 +541,101 @@ class EnergyLoweringDistortionsTestCase(unittest.TestCase):
         )
         self.assertTrue(
             os.path.exists(
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-1/Bond_Distortion_-55.0%_from_0/POSCAR"
+                f"{vm1}/Bond_Distortion_-55.0%_from_0/POSCAR"
             )
         )
 
     # functionality of compare_struct_to_distortions() essentially tested through
     # above tests for `get_energy_lowering_distortions`
 
+    def _check_code_distorted_inputs(
+        self,
+        low_energy_defects_dict,
+        src_dir,
+        code_dir,
+        code,
+        input_filename,
+        input_subdir,
+        old_input_files,
+        structure_filename,
+        read_structure,
+    ):
+        """
+        Copy the vac_1_Cd folders from src_dir to code_dir, add an input file for
+        `code` and check the input and structure files written by
+        write_distorted_inputs().
+        """
+        with os.scandir(src_dir) as entries:
+            defect_dirs = [
+                entry
+                for entry in entries
+                if entry.name.startswith("vac_1_Cd") and entry.is_dir(follow_symlinks=False)
+            ]
+        # destination folders are disjoint, so clone them concurrently
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+            list(
+                executor.map(
+                    lambda entry: _clone_tree(
+                        entry.path, os.path.join(code_dir, entry.name)
+                    ),
+                    defect_dirs,
+                )
+            )
+        root = f"{code_dir}/vac_1_Cd_-1"
+        bd55 = f"{root}/Bond_Distortion_-55.0%_from_0"
+        old_input_subdir, old_filenames = old_input_files
+        for filename in old_filenames:
+            if_present_rm(f"{root}/{old_input_subdir}/{filename}")
+        if_present_rm(bd55)
+        # Copy over input file (as a hard link, as it is only read afterwards)
+        input_src = f"{code_dir}/vac_1_Cd_0/Bond_Distortion_30.0%/{input_filename}"
+        input_dst = f"{root}/{input_subdir}/{input_filename}"
+        if_present_rm(input_dst)
+        try:
+            os.link(input_src, input_dst)
+        except OSError:
+            shutil.copy(input_src, input_dst)
+        energy_lowering_distortions.write_distorted_inputs(
+            low_energy_defects=low_energy_defects_dict,
+            output_path=code_dir,
+            code=code,
+        )
+        self.assertTrue(os.path.exists(f"{bd55}/{input_filename}"))
+        # Check structure
+        struct = read_structure(f"{bd55}/{structure_filename}")
+        ref_struct = self.V_Cd_minus_0pt55_structure
+        self.assertEqual(len(struct), len(ref_struct))
+        self.assertEqual(
+            sorted(site.specie.symbol for site in struct),
+            sorted(site.specie.symbol for site in ref_struct),
+        )
+        np.testing.assert_allclose(
+            struct.lattice.matrix, ref_struct.lattice.matrix, atol=1e-4
+        )
+        # normalised RMS displacement, as in analysis._calculate_atomic_disp():
+        norm_length = (ref_struct.volume / len(ref_struct)) ** (1 / 3)
+        for disps in (
+            _atomic_disp_fast(struct, ref_struct),
+            # and vice versa, so a duplicated atom replacing another is caught:
+            _atomic_disp_fast(ref_struct, struct),
+        ):
+            self.assertLess(np.sqrt(np.mean(disps**2)) / norm_length, 0.01)
+
     def test_write_distorted_inputs(self):
         """Test write_distorted_inputs()."""
         for fake_distortion_dir in ["Bond_Distortion_-7.5%", "Unperturbed"]:
-            if not os.path.exists(
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-1/{fake_distortion_dir}"
-            ):
-                os.mkdir(f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-1/{fake_distortion_dir}")
-            shutil.copyfile(
+            os.makedirs(
+                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-1/{fake_distortion_dir}", exist_ok=True
+            )
+            _link(
                 f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_0/Bond_Distortion_-20.0%/CONTCAR",
                 f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-1/{fake_distortion_dir}/CONTCAR",
             )
         for fake_distortion_dir in ["Bond_Distortion_-35.0%", "Unperturbed"]:
-            if not os.path.exists(
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2/{fake_distortion_dir}"
-            ):
-                os.mkdir(f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2/{fake_distortion_dir}")
-            shutil.copyfile(
+            os.makedirs(
+                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2/{fake_distortion_dir}", exist_ok=True
+            )
+            _link(
                 f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_0/Bond_Distortion_-20.0%/CONTCAR",
                 f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2/{fake_distortion_dir}/CONTCAR",
             )
@@ -522,10 +645,9 @@ class EnergyLoweringDistortionsTestCase(unittest.TestCase):
             -206.700
             Unperturbed
             -205.800"""
-        with open(
-            os.path.join(self.VASP_CDTE_DATA_DIR, "vac_1_Cd_-1/vac_1_Cd_-1.txt"), "w"
-        ) as fp:
-            fp.write(V_Cd_1_txt_w_distortion)
+        Path(self.VASP_CDTE_DATA_DIR, "vac_1_Cd_-1/vac_1_Cd_-1.txt").write_text(
+            V_Cd_1_txt_w_distortion
+        )
 
         low_energy_defects_dict = (
             energy_lowering_distortions.get_energy_lowering_distortions(
@@ -555,41 +677,28 @@ class EnergyLoweringDistortionsTestCase(unittest.TestCase):
                 f"so just writing distorted POSCAR file to "
                 f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2/Bond_Distortion_-55.0%_from_0 directory."
             )
-            self.assertEqual(
-                self.V_Cd_minus_0pt55_structure,
-                Structure.from_file(
+            assert_structures_equal(
+                [self.V_Cd_minus_0pt55_structure],
+                [load_structure(
                     f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-1/Bond_Distortion_-55.0%_from_0/POSCAR"
-                ),
+                )],
             )  # TODO: Flesh out tests
 
         # Test for copying over VASP input files (INCAR, KPOINTS and (empty)
         # POTCAR files)
-        if_present_rm(
-            os.path.join(
-                self.VASP_CDTE_DATA_DIR, "vac_1_Cd_-1/Bond_Distortion_-55.0%_from_0"
-            )
-        )
-        if not os.path.exists(
-            os.path.join(self.VASP_CDTE_DATA_DIR, "vac_1_Cd_-1/Unperturbed/")
-        ):
-            os.mkdir(os.path.join(self.VASP_CDTE_DATA_DIR, "vac_1_Cd_-1/Unperturbed"))
+        root = f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-1"
+        bd55 = f"{root}/Bond_Distortion_-55.0%_from_0"
+        unp = f"{root}/Unperturbed"
+        if_present_rm(bd55)
+        os.makedirs(unp, exist_ok=True)
         # Write VASP input files to Unperturbed directory
-        with open(
-            os.path.join(self.VASP_CDTE_DATA_DIR, "vac_1_Cd_-1/Unperturbed/INCAR"), "w"
-        ) as fp:
-            incar = "NCORE = 12\nISYM = 0\nIBRION = 2\n"
-            fp.write(incar)
-        with open(
-            os.path.join(self.VASP_CDTE_DATA_DIR, "vac_1_Cd_-1/Unperturbed/KPOINTS"),
-            "w",
-        ) as fp:
-            kpoints = "0\nGamma\n1 1 1\n0.00   0.00   0.00\n"
-            fp.write(kpoints)
-        with open(
-            os.path.join(self.VASP_CDTE_DATA_DIR, "vac_1_Cd_-1/Unperturbed/POTCAR"), "w"
-        ) as fp:
-            potcar = f" "
-            fp.write(potcar)  # empty POTCAR file
+        unperturbed_dir = Path(unp)
+        incar = "NCORE = 12\nISYM = 0\nIBRION = 2\n"
+        (unperturbed_dir / "INCAR").write_text(incar)
+        kpoints = "0\nGamma\n1 1 1\n0.00   0.00   0.00\n"
+        (unperturbed_dir / "KPOINTS").write_text(kpoints)
+        potcar = f" "
+        (unperturbed_dir / "POTCAR").write_text(potcar)  # empty POTCAR file
 
         # Test if VASP input files are copied over
         low_energy_defects_dict = (
@@ -606,259 +715,58 @@ class EnergyLoweringDistortionsTestCase(unittest.TestCase):
             ("INCAR", incar),
             ("POTCAR", potcar),
         ]:
-            self.assertTrue(
-                os.path.exists(
-                    os.path.join(
-                        self.VASP_CDTE_DATA_DIR,
-                        f"vac_1_Cd_-1/Bond_Distortion_-55.0%_from_0/{filename}",
-                    )
-                )
-            )
-            with open(
-                os.path.join(
-                    self.VASP_CDTE_DATA_DIR,
-                    f"vac_1_Cd_-1/Bond_Distortion_-55.0%_from_0/{filename}",
-                ),
-                "r",
-            ) as fp:
+            with open(f"{bd55}/{filename}", "r") as fp:  # fails if not written
                 self.assertEqual(fp.read(), file_string)
 
-        # Test CP2K input files
-        for i in os.listdir(self.VASP_CDTE_DATA_DIR):
-            if i.startswith("vac_1_Cd") and os.path.isdir(os.path.join(self.VASP_CDTE_DATA_DIR, i)):
-                shutil.copytree(
-                    os.path.join(self.VASP_CDTE_DATA_DIR, i),
-                    os.path.join(self.CP2K_DATA_DIR, i),
-                    dirs_exist_ok=True
-                )
-        for filename in ["KPOINTS", "INCAR", "POTCAR"]:
-            if_present_rm(
-                os.path.join(self.CP2K_DATA_DIR, f"vac_1_Cd_-1/Unperturbed/{filename}")
-            )
-        if_present_rm(
-            os.path.join(
-                self.CP2K_DATA_DIR, "vac_1_Cd_-1/Bond_Distortion_-55.0%_from_0"
-            )
-        )
-        shutil.copy(
-            os.path.join(
-                self.CP2K_DATA_DIR, "vac_1_Cd_0/Bond_Distortion_30.0%/cp2k_input.inp"
-            ),
-            os.path.join(self.CP2K_DATA_DIR, "vac_1_Cd_-1/Unperturbed/cp2k_input.inp"),
-        )  # Copy over CP2K input file
-        energy_lowering_distortions.write_distorted_inputs(
-            low_energy_defects=low_energy_defects_dict,
-            output_path=self.CP2K_DATA_DIR,
-            code="CP2K",
-        )
-        self.assertTrue(
-            os.path.exists(
-                os.path.join(
-                    self.CP2K_DATA_DIR,
-                    "vac_1_Cd_-1/Bond_Distortion_-55.0%_from_0/cp2k_input.inp",
-                )
-            )
-        )
-        # Check structure
-        # self.assertEqual(
-        #     Structure.from_file(os.path.join(
-        #         self.CP2K_DATA_DIR,
-        #         "vac_1_Cd_-1/Bond_Distortion_-55.0%_from_0/structure.cif"
-        #     )),
-        #     self.V_Cd_minus_0pt55_structure
-        # )
-        struct = Structure.from_file(
-            os.path.join(
-                self.CP2K_DATA_DIR,
-                "vac_1_Cd_-1/Bond_Distortion_-55.0%_from_0/structure.cif",
-            )
-        )
-        self.assertTrue(
-            analysis._calculate_atomic_disp(struct, self.V_Cd_minus_0pt55_structure)[0]
-            < 0.01
-        )
-
-        # Test copying over Quantum Espresso input files
-        for i in os.listdir(self.CP2K_DATA_DIR):
-            if i.startswith("vac_1_Cd") and os.path.isdir(os.path.join(self.CP2K_DATA_DIR,i)):
-                shutil.copytree(
-                    os.path.join(self.CP2K_DATA_DIR, i),
-                    os.path.join(self.ESPRESSO_DATA_DIR, i),
-                    dirs_exist_ok=True
-                )
-        if_present_rm(
-            os.path.join(
-                self.ESPRESSO_DATA_DIR, "vac_1_Cd_-1/Bond_Distortion_-55.0%_from_0"
-            )
-        )
-        shutil.copy(
-            os.path.join(
-                self.ESPRESSO_DATA_DIR, "vac_1_Cd_0/Bond_Distortion_30.0%/espresso.pwi"
-            ),
-            os.path.join(
-                self.ESPRESSO_DATA_DIR, f"vac_1_Cd_-1/Unperturbed/espresso.pwi"
-            ),
-        )  # Copy over Quantum Espresso input file
-        for filename in [
-            "cp2k_input.inp",
-        ]:
-            if_present_rm(
-                os.path.join(
-                    self.ESPRESSO_DATA_DIR, f"vac_1_Cd_-1/Unperturbed/{filename}"
-                )
-            )
-        energy_lowering_distortions.write_distorted_inputs(
-            low_energy_defects=low_energy_defects_dict,
-            output_path=self.ESPRESSO_DATA_DIR,
-            code="espresso",
-        )
-        self.assertTrue(
-            os.path.exists(
-                os.path.join(
-                    self.ESPRESSO_DATA_DIR,
-                    f"vac_1_Cd_-1/Bond_Distortion_-55.0%_from_0/espresso.pwi",
-                )
-            )
-        )
-        # Check structure in the input file
-        atoms = ase.io.espresso.read_espresso_in(
-            os.path.join(
-                self.ESPRESSO_DATA_DIR,
-                f"vac_1_Cd_-1/Bond_Distortion_-55.0%_from_0/espresso.pwi",
-            )
-        )
-        aaa = AseAtomsAdaptor()
-        struct = aaa.get_structure(atoms)
-        # self.assertEqual(
-        #     struct,
-        #     self.V_Cd_minus_0pt55_structure
-        # )
-        self.assertTrue(
-            analysis._calculate_atomic_disp(struct, self.V_Cd_minus_0pt55_structure)[0]
-            < 0.01
-        )
-
-        # Test copying over FHI-aims input files when the input files are only
-        # present in one distortion directory (different from Unperturbed)
-        # Test copying over Quantum Espresso input files
-        for i in os.listdir(self.ESPRESSO_DATA_DIR):
-            if i.startswith("vac_1_Cd") and os.path.isdir(os.path.join(self.ESPRESSO_DATA_DIR,i)):
-                shutil.copytree(
-                    os.path.join(self.ESPRESSO_DATA_DIR, i),
-                    os.path.join(self.FHI_AIMS_DATA_DIR, i),
-                    dirs_exist_ok=True
-                )
-        if_present_rm(
-            os.path.join(
-                self.FHI_AIMS_DATA_DIR, "vac_1_Cd_-1/Bond_Distortion_-55.0%_from_0"
-            )
-        )
-        shutil.copy(
-            os.path.join(
-                self.FHI_AIMS_DATA_DIR, "vac_1_Cd_0/Bond_Distortion_30.0%/control.in"
+        # Test writing input files for other codes, where each stage starts from
+        # the vac_1_Cd folders of the previous one:
+        stages = [
+            dict(
+                src_dir=self.VASP_CDTE_DATA_DIR,
+                code_dir=self.CP2K_DATA_DIR,
+                code="CP2K",
+                input_filename="cp2k_input.inp",
+                input_subdir="Unperturbed",
+                old_input_files=("Unperturbed", ["KPOINTS", "INCAR", "POTCAR"]),
+                structure_filename="structure.cif",
+                read_structure=Structure.from_file,
             ),
-            os.path.join(
-                self.FHI_AIMS_DATA_DIR, f"vac_1_Cd_-1/Bond_Distortion_-7.5%/control.in"
+            dict(
+                src_dir=self.CP2K_DATA_DIR,
+                code_dir=self.ESPRESSO_DATA_DIR,
+                code="espresso",
+                input_filename="espresso.pwi",
+                input_subdir="Unperturbed",
+                old_input_files=("Unperturbed", ["cp2k_input.inp"]),
+                structure_filename="espresso.pwi",
+                read_structure=lambda path: self._aaa.get_structure(
+                    ase.io.espresso.read_espresso_in(path)
+                ),
             ),
-        )  # Copy over FHI-aims input file
-        for filename in [
-            "espresso.pwi",
-        ]:
-            if_present_rm(
-                os.path.join(
-                    self.FHI_AIMS_DATA_DIR, f"vac_1_Cd_-1/Unperturbed/{filename}"
-                )
-            )
-        energy_lowering_distortions.write_distorted_inputs(
-            low_energy_defects=low_energy_defects_dict,
-            output_path=self.FHI_AIMS_DATA_DIR,
-            code="FHI-aims",
-        )
-        self.assertTrue(
-            os.path.exists(
-                os.path.join(
-                    self.FHI_AIMS_DATA_DIR,
-                    f"vac_1_Cd_-1/Bond_Distortion_-55.0%_from_0/control.in",
-                )
-            )
-        )
-        # Check structure
-        struct = io.read_fhi_aims_structure(
-            os.path.join(
-                self.FHI_AIMS_DATA_DIR,
-                f"vac_1_Cd_-1/Bond_Distortion_-55.0%_from_0/geometry.in",
-            )
-        )
-        # self.assertEqual(
-        #     struct,
-        #     self.V_Cd_minus_0pt55_structure
-        # )
-        self.assertTrue(
-            analysis._calculate_atomic_disp(struct, self.V_Cd_minus_0pt55_structure)[0]
-            < 0.01
-        )
-
-        # Test CASTEP input files
-        for i in os.listdir(self.FHI_AIMS_DATA_DIR):
-            if i.startswith("vac_1_Cd") and os.path.isdir(os.path.join(self.FHI_AIMS_DATA_DIR, i)):
-                shutil.copytree(
-                    os.path.join(self.FHI_AIMS_DATA_DIR, i),
-                    os.path.join(self.CASTEP_DATA_DIR, i),
-                    dirs_exist_ok=True
-                )
-        if_present_rm(
-            os.path.join(
-                self.CASTEP_DATA_DIR, "vac_1_Cd_-1/Bond_Distortion_-55.0%_from_0"
-            )
-        )
-        shutil.copy(
-            os.path.join(
-                self.CASTEP_DATA_DIR, "vac_1_Cd_0/Bond_Distortion_30.0%/castep.param"
+            dict(  # input file only present in one distortion folder (not Unperturbed)
+                src_dir=self.ESPRESSO_DATA_DIR,
+                code_dir=self.FHI_AIMS_DATA_DIR,
+                code="FHI-aims",
+                input_filename="control.in",
+                input_subdir="Bond_Distortion_-7.5%",
+                old_input_files=("Unperturbed", ["espresso.pwi"]),
+                structure_filename="geometry.in",
+                read_structure=io.read_fhi_aims_structure,
             ),
-            os.path.join(
-                self.CASTEP_DATA_DIR, f"vac_1_Cd_-1/Bond_Distortion_-7.5%/castep.param"
+            dict(
+                src_dir=self.FHI_AIMS_DATA_DIR,
+                code_dir=self.CASTEP_DATA_DIR,
+                code="CASTEP",
+                input_filename="castep.param",
+                input_subdir="Bond_Distortion_-7.5%",
+                old_input_files=("Bond_Distortion_-7.5%", ["control.in"]),
+                structure_filename="castep.cell",
+                read_structure=lambda path: self._aaa.get_structure(ase.io.read(path)),
             ),
-        )  # Copy over CASTEP input file
-        for filename in [
-            "control.in",
-        ]:
-            if_present_rm(
-                os.path.join(
-                    self.CASTEP_DATA_DIR,
-                    f"vac_1_Cd_-1/Bond_Distortion_-7.5%/{filename}",
-                )
-            )
-        energy_lowering_distortions.write_distorted_inputs(
-            low_energy_defects=low_energy_defects_dict,
-            output_path=self.CASTEP_DATA_DIR,
-            code="CASTEP",
-        )
-        self.assertTrue(
-            os.path.exists(
-                os.path.join(
-                    self.CASTEP_DATA_DIR,
-                    f"vac_1_Cd_-1/Bond_Distortion_-55.0%_from_0/castep.param",
-                )
-            )
-        )
-        # Check structure
-        struct = aaa.get_structure(
-            ase.io.read(
-                os.path.join(
-                    self.CASTEP_DATA_DIR,
-                    f"vac_1_Cd_-1/Bond_Distortion_-55.0%_from_0/castep.cell",
-                )
-            )
-        )
-        # self.assertEqual(
-        #     struct,
-        #     self.V_Cd_minus_0pt55_structure
-        # )
-        self.assertTrue(
-            analysis._calculate_atomic_disp(struct, self.V_Cd_minus_0pt55_structure)[0]
-            < 0.01
-        )
-
+        ]
+        for stage in stages:
+            with self.subTest(code=stage["code"]):
+                self._check_code_distorted_inputs(low_energy_defects_dict, **stage)
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,82 +2,147 @@ import unittest
 import os
 import shutil
 import warnings
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
+from types import MappingProxyType
 import pytest
 
 import numpy as np
 
+import matplotlib as mpl
+
+mpl.use("Agg")  # non-interactive backend, set before pyplot is imported
+import matplotlib.pyplot as plt
+
 from shakenbreak import analysis
 from shakenbreak import plotting
 
-import matplotlib as mpl
-import matplotlib.pyplot as plt
+plt.ioff()
+
+# ignore matplotlib deprecation warnings from plotting calls in every test (also
+# keeping them out of the warnings recorded by tests with catch_warnings):
+pytestmark = pytest.mark.filterwarnings(
+    "ignore::matplotlib.MatplotlibDeprecationWarning"
+)
 
 
 def if_present_rm(path):
-    if os.path.exists(path):
-        shutil.rmtree(path)
+    try:
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def clone_organized_data(energies_dict):
+    """
+    Copy an organized energies dict (as returned by `analysis._organize_data`),
+    copying the nested "distortions" dict while sharing its float values.
+    """
+    return {
+        key: dict(value) if isinstance(value, Mapping) else value
+        for key, value in energies_dict.items()
+    }
 
 
 file_path = os.path.dirname(__file__)
+_DATA_DIR = os.path.join(file_path, "data")
+_VASP_CDTE_DATA_DIR = os.path.join(_DATA_DIR, "vasp/CdTe")
+_V_CD_PATH = os.path.join(_VASP_CDTE_DATA_DIR, "CdTe_vac_1_Cd_0_stdev_0.25.txt")
+_V_CD_NO_UNPERTURBED_PATH = os.path.join(
+    _VASP_CDTE_DATA_DIR, "CdTe_vac_1_Cd_0_stdev_0.25_no_unperturbed.txt"
+)
 
 
 class PlottingDefectsTestCase(unittest.TestCase):
-    def setUp(self):
-        self.DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
-        self.VASP_CDTE_DATA_DIR = os.path.join(self.DATA_DIR, "vasp/CdTe")
-        self.V_Cd_distortion_data = analysis._open_file(
-            os.path.join(self.VASP_CDTE_DATA_DIR, "CdTe_vac_1_Cd_0_stdev_0.25.txt")
-        )
-        self.organized_V_Cd_distortion_data = analysis._organize_data(
-            self.V_Cd_distortion_data
-        )
-        self.V_Cd_distortion_data_no_unperturbed = analysis._open_file(
-            os.path.join(
-                self.VASP_CDTE_DATA_DIR, "CdTe_vac_1_Cd_0_stdev_0.25_no_unperturbed.txt"
+    @classmethod
+    def setUpClass(cls):
+        cls.addClassCleanup(plt.close, "all")
+        # parse data files once per class, rather than for each test
+        cls.DATA_DIR = _DATA_DIR
+        cls.VASP_CDTE_DATA_DIR = _VASP_CDTE_DATA_DIR
+        parsed_data = {}
+        # read files concurrently, then organize the data serially
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            (
+                parsed_data["V_Cd_distortion_data"],
+                parsed_data["V_Cd_distortion_data_no_unperturbed"],
+            ) = executor.map(
+                analysis._open_file, [_V_CD_PATH, _V_CD_NO_UNPERTURBED_PATH]
             )
+        parsed_data["organized_V_Cd_distortion_data"] = analysis._organize_data(
+            parsed_data["V_Cd_distortion_data"]
         )
-        self.organized_V_Cd_distortion_data_no_unperturbed = analysis._organize_data(
-            self.V_Cd_distortion_data_no_unperturbed
-        )
-        self.V_Cd_energies_dict = analysis.get_energies(
+        parsed_data[
+            "organized_V_Cd_distortion_data_no_unperturbed"
+        ] = analysis._organize_data(parsed_data["V_Cd_distortion_data_no_unperturbed"])
+        parsed_data["V_Cd_energies_dict"] = analysis.get_energies(
             defect_species="vac_1_Cd_0",
-            output_path=self.VASP_CDTE_DATA_DIR,
+            output_path=cls.VASP_CDTE_DATA_DIR,
         )
-        self.V_Cd_displacement_dict = analysis.calculate_struct_comparison(
+        parsed_data["V_Cd_displacement_dict"] = analysis.calculate_struct_comparison(
             defect_structures_dict=analysis.get_structures(
                 defect_species="vac_1_Cd_0",
-                output_path=self.VASP_CDTE_DATA_DIR,
+                output_path=cls.VASP_CDTE_DATA_DIR,
             )
         )
-        self.V_O_energies_dict_afm = analysis._sort_data(
-            energies_file=f"{self.DATA_DIR}/vasp/rTiO2_vac_2_O_0_nupdown_0.txt",
+        parsed_data["V_O_energies_dict_afm"] = analysis._sort_data(
+            energies_file=f"{cls.DATA_DIR}/vasp/rTiO2_vac_2_O_0_nupdown_0.txt",
         )[0]
-        self.V_O_energies_dict_fm = analysis._sort_data(
-            energies_file=f"{self.DATA_DIR}/vasp/rTiO2_vac_2_O_0_nupdown_2.txt",
+        parsed_data["V_O_energies_dict_fm"] = analysis._sort_data(
+            energies_file=f"{cls.DATA_DIR}/vasp/rTiO2_vac_2_O_0_nupdown_2.txt",
         )[0]
-        self.V_Cd_energies_dict_from_other_charge_states = analysis._sort_data(
-            energies_file=f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_0/fake_vac_1_Cd_0.txt"
+        parsed_data["V_Cd_energies_dict_from_other_charge_states"] = analysis._sort_data(
+            energies_file=f"{cls.VASP_CDTE_DATA_DIR}/vac_1_Cd_0/fake_vac_1_Cd_0.txt"
         )[0]
 
-        self.V_Cd_m2_energies_dict = analysis._sort_data(
-            energies_file=f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2.txt"
+        parsed_data["V_Cd_m2_energies_dict"] = analysis._sort_data(
+            energies_file=f"{cls.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2.txt"
         )[0]
 
-        self.V_Cd_m2_energies_dict_from_other_charge_states = analysis._sort_data(
-            energies_file=f"{self.VASP_CDTE_DATA_DIR}/fake_V_Cd_-2_from_other_charge_states.txt"
+        parsed_data["V_Cd_m2_energies_dict_from_other_charge_states"] = analysis._sort_data(
+            energies_file=f"{cls.VASP_CDTE_DATA_DIR}/fake_V_Cd_-2_from_other_charge_states.txt"
         )[0]
+        # read-only view of organized V_Cd data, for tests which only read it
+        # (or take a copy with clone_organized_data()), so it isn't copied in setUp
+        organized_V_Cd = parsed_data.pop("organized_V_Cd_distortion_data")
+        cls.organized_V_Cd_distortion_data = MappingProxyType(
+            {
+                key: MappingProxyType(value) if isinstance(value, dict) else value
+                for key, value in organized_V_Cd.items()
+            }
+        )
+        cls._parsed_data = parsed_data
+        # expected V_Cd distortion energies in meV, converted in one array operation
+        V_Cd_distortions = cls.organized_V_Cd_distortion_data["distortions"]
+        cls._V_Cd_distortion_keys = list(V_Cd_distortions.keys())
+        cls._expected_V_Cd_distortions_meV = (
+            np.fromiter(V_Cd_distortions.values(), dtype=np.float64) * 1000
+        )
+        cls._expected_V_Cd_unperturbed_meV = (
+            1000 * cls.organized_V_Cd_distortion_data["Unperturbed"]
+        )
 
-        if not os.path.exists(f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2"):
-            os.mkdir(f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2")
+        # vac_1_Cd_-2 folder is only read by the tests, so create it once per class
+        if not os.path.exists(f"{cls.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2"):
+            os.mkdir(f"{cls.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2")
             shutil.copyfile(
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2.txt",
-                f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2/vac_1_Cd_-2.txt",
+                f"{cls.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2.txt",
+                f"{cls.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2/vac_1_Cd_-2.txt",
             )
+        cls.addClassCleanup(if_present_rm, f"{cls.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2")
+
+    def setUp(self):
+        # plotting functions may modify the dicts they are given, so each test
+        # gets its own copy of the parsed data
+        for attr, data in self._parsed_data.items():
+            setattr(self, attr, deepcopy(data))
 
     def tearDown(self):
         if_present_rm(f"{os.getcwd()}/distortion_plots")
-        if_present_rm(f"{self.VASP_CDTE_DATA_DIR}/vac_1_Cd_-2")
 
     def test_verify_data_directories_exist(self):
         """Test _verify_data_directories_exist() function"""
@@ -283,44 +348,35 @@ class PlottingDefectsTestCase(unittest.TestCase):
 
     def test_format_defect_name(self):
         """Test _format_defect_name() function."""
-        # test standard behaviour
-        formatted_name = plotting._format_defect_name(
-            defect_species="vac_1_Cd_0",
-            include_site_num_in_name=False,
-        )
-        self.assertEqual(formatted_name, "V$_{Cd}^{0}$")
-        # test with site number included
-        formatted_name = plotting._format_defect_name(
-            defect_species="vac_1_Cd_0",
-            include_site_num_in_name=True,
-        )
-        self.assertEqual(formatted_name, "V$_{Cd_1}^{0}$")
-        # test interstitial case
-        formatted_name = plotting._format_defect_name(
-            defect_species="Int_Cd_1_0",
-            include_site_num_in_name=True,
-        )
-        self.assertEqual(formatted_name, "Cd$_{i_1}^{0}$")
-        # check exceptions raised: invalid charge or defect_species
-        self.assertRaises(
-            ValueError,
-            plotting._format_defect_name,
-            defect_species="vac_1_Cd_a",
-            include_site_num_in_name=True,
-        )
-        self.assertRaises(
-            TypeError,
-            plotting._format_defect_name,
-            defect_species=2,
-            include_site_num_in_name=True,
-        )
-        # check invalid defect type
-        self.assertRaises(
-            ValueError,
-            plotting._format_defect_name,
-            defect_species="kk_Cd_1_0",
-            include_site_num_in_name=True,
-        )
+        for defect_species, include_site_num_in_name, expected_name in [
+            ("vac_1_Cd_0", False, "V$_{Cd}^{0}$"),  # standard behaviour
+            ("vac_1_Cd_0", True, "V$_{Cd_1}^{0}$"),  # with site number included
+            ("Int_Cd_1_0", True, "Cd$_{i_1}^{0}$"),  # interstitial case
+        ]:
+            with self.subTest(
+                defect_species=defect_species,
+                include_site_num_in_name=include_site_num_in_name,
+            ):
+                self.assertEqual(
+                    plotting._format_defect_name(
+                        defect_species=defect_species,
+                        include_site_num_in_name=include_site_num_in_name,
+                    ),
+                    expected_name,
+                )
+        # check exceptions raised: invalid charge, defect_species or defect type
+        for defect_species, exception in [
+            ("vac_1_Cd_a", ValueError),  # invalid charge
+            (2, TypeError),  # invalid defect_species
+            ("kk_Cd_1_0", ValueError),  # invalid defect type
+        ]:
+            with self.subTest(defect_species=defect_species), self.assertRaises(
+                exception
+            ):
+                plotting._format_defect_name(
+                    defect_species=defect_species,
+                    include_site_num_in_name=True,
+                )
 
     def test_cast_energies_to_floats(self):
         """Test _cast_energies_to_floats() function."""
@@ -354,20 +410,19 @@ class PlottingDefectsTestCase(unittest.TestCase):
             max_energy_above_unperturbed,
             y_label,
         ) = plotting._change_energy_units_to_meV(
-            energies_dict=deepcopy(self.organized_V_Cd_distortion_data),
+            energies_dict=clone_organized_data(self.organized_V_Cd_distortion_data),
             max_energy_above_unperturbed=0.2,
             y_label="Energy (eV)",
         )
-        self.assertEqual(
-            energies_dict["distortions"],
-            {
-                k: 1000 * v
-                for k, v in self.organized_V_Cd_distortion_data["distortions"].items()
-            },
+        self.assertEqual(list(energies_dict["distortions"]), self._V_Cd_distortion_keys)
+        np.testing.assert_allclose(
+            np.fromiter(energies_dict["distortions"].values(), dtype=np.float64),
+            self._expected_V_Cd_distortions_meV,
+            rtol=0,
+            atol=0,
         )
         self.assertEqual(
-            energies_dict["Unperturbed"],
-            1000 * self.organized_V_Cd_distortion_data["Unperturbed"],
+            energies_dict["Unperturbed"], self._expected_V_Cd_unperturbed_meV
         )
         self.assertEqual(max_energy_above_unperturbed, 0.2 * 1000)
         self.assertEqual(y_label, "Energy (meV)")
@@ -378,7 +433,7 @@ class PlottingDefectsTestCase(unittest.TestCase):
         disp_dict = deepcopy(self.V_Cd_displacement_dict)
         disp_dict.pop(-0.6)  # Missing data point
         disp_dict, energies_dict = plotting._purge_data_dicts(
-            energies_dict=deepcopy(self.organized_V_Cd_distortion_data),
+            energies_dict=clone_organized_data(self.organized_V_Cd_distortion_data),
             disp_dict=deepcopy(disp_dict),
         )
         self.assertEqual(
@@ -387,10 +442,10 @@ class PlottingDefectsTestCase(unittest.TestCase):
             {"Unperturbed"},
         )  # only difference should be Unperturbed
         # Test behaviour when energy dict is incomplete
-        energies_dict = deepcopy(self.organized_V_Cd_distortion_data)
+        energies_dict = clone_organized_data(self.organized_V_Cd_distortion_data)
         energies_dict["distortions"].pop(-0.6)
         disp_dict, energies_dict = plotting._purge_data_dicts(
-            energies_dict=deepcopy(self.organized_V_Cd_distortion_data),
+            energies_dict=clone_organized_data(self.organized_V_Cd_distortion_data),
             disp_dict=deepcopy(disp_dict),
         )
         self.assertEqual(